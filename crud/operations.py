@@ -1,39 +1,87 @@
+import queue
 import sqlite3
+from contextlib import contextmanager
+
+from db.util import configure
 
 DB_PATH = "/Users/yashbhoomkar/Desktop/BloombergProjects/ragasTest/v1/data/company.db"
 
+# Kept as constants so single-row and bulk helpers share one cached prepared statement
+_INSERT_CUSTOMER = """
+    INSERT INTO customers (FirstName, LastName, Email, Country)
+    VALUES (?, ?, ?, ?)
+"""
+_SELECT_CUSTOMERS = "SELECT CustomerId, FirstName, LastName, Email, Country FROM customers"
+_UPDATE_CUSTOMER_EMAIL = """
+    UPDATE customers
+    SET Email = ?
+    WHERE CustomerId = ?
+"""
+_DELETE_CUSTOMER = "DELETE FROM customers WHERE CustomerId = ?"
+
+# Idle connections are kept open so SQLite's page cache survives between calls
+_pool = queue.Queue()
+
+def _connect():
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None, cached_statements=256)
+    configure(conn, DB_PATH)
+    conn.execute("PRAGMA cache_size=-20000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+@contextmanager
+def _checkout():
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = _connect()
+    try:
+        yield conn
+    finally:
+        _return(conn)
+
+def _return(conn):
+    if conn.in_transaction:
+        conn.rollback()
+    _pool.put(conn)
+
+@contextmanager
+def _transaction():
+    with _checkout() as conn:
+        conn.execute("BEGIN")
+        yield conn
+        conn.execute("COMMIT")
+
 def create_customer(first_name, last_name, email, country):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO customers (FirstName, LastName, Email, Country)
-        VALUES (?, ?, ?, ?)
-    """, (first_name, last_name, email, country))
-    conn.commit()
-    conn.close()
+    with _checkout() as conn:
+        conn.execute(_INSERT_CUSTOMER, (first_name, last_name, email, country))
+
+def create_customers(rows):
+    with _transaction() as conn:
+        conn.executemany(_INSERT_CUSTOMER, rows)
+
+def iter_customers(chunk_size=1000):
+    with _checkout() as conn:
+        cursor = conn.execute(_SELECT_CUSTOMERS)
+        cursor.arraysize = chunk_size
+        while rows := cursor.fetchmany():
+            yield from rows
 
 def read_customers():
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("SELECT CustomerId, FirstName, LastName, Email, Country FROM customers")
-    customers = cursor.fetchall()
-    conn.close()
-    return customers
+    return list(iter_customers())
 
 def update_customer_email(customer_id, new_email):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("""
-        UPDATE customers
-        SET Email = ?
-        WHERE CustomerId = ?
-    """, (new_email, customer_id))
-    conn.commit()
-    conn.close()
+    with _checkout() as conn:
+        conn.execute(_UPDATE_CUSTOMER_EMAIL, (new_email, customer_id))
+
+def update_customer_emails(pairs):
+    with _transaction() as conn:
+        conn.executemany(_UPDATE_CUSTOMER_EMAIL, [(new_email, customer_id) for customer_id, new_email in pairs])
 
 def delete_customer(customer_id):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM customers WHERE CustomerId = ?", (customer_id,))
-    conn.commit()
-    conn.close()
+    with _checkout() as conn:
+        conn.execute(_DELETE_CUSTOMER, (customer_id,))
+
+def delete_customers(customer_ids):
+    with _transaction() as conn:
+        conn.executemany(_DELETE_CUSTOMER, [(cid,) for cid in customer_ids])
@@ -0,0 +1,7 @@
+def configure(conn, db_path):
+    # journal_mode sticks to the database file; synchronous is per connection
+    if db_path == ":memory:":
+        return conn
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
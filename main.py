@@ -1,13 +1,12 @@
 from crud.operations import (
     create_customer,
-    read_customers,
+    iter_customers,
     update_customer_email,
     delete_customer
 )
 
 def print_customers():
-    customers = read_customers()
-    for cust in customers:
+    for cust in iter_customers():
         print(f"{cust[0]}: {cust[1]} {cust[2]}, {cust[3]}, {cust[4]}")
 
 if __name__ == "__main__":
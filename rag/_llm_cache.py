@@ -0,0 +1,65 @@
+import functools
+import hashlib
+import inspect
+import os
+import sqlite3
+import threading
+
+from db.util import configure
+
+CACHE_PATH = "cache/llm.db"
+
+_lock = threading.Lock()
+_conn = None
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        _conn = sqlite3.connect(CACHE_PATH, check_same_thread=False, isolation_level=None)
+        configure(_conn, CACHE_PATH)
+        _conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content TEXT NOT NULL)")
+    return _conn
+
+def _cache_key(model, prompt):
+    return hashlib.sha256(f"{model}\0{prompt}".encode()).hexdigest()
+
+def _lookup(key):
+    with _lock:
+        row = _get_conn().execute("SELECT content FROM responses WHERE key = ?", (key,)).fetchone()
+    return row[0] if row is not None else None
+
+def _store(key, content):
+    with _lock:
+        _get_conn().execute("INSERT OR REPLACE INTO responses (key, content) VALUES (?, ?)", (key, content))
+
+def llm_cache(func):
+    # Wraps a (model, prompt) -> str call, sync or async; set RAG_NO_CACHE=1 to always hit the model
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(model, prompt):
+            if os.environ.get("RAG_NO_CACHE"):
+                return await func(model, prompt)
+
+            key = _cache_key(model, prompt)
+            content = _lookup(key)
+            if content is None:
+                content = await func(model, prompt)
+                _store(key, content)
+            return content
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(model, prompt):
+        if os.environ.get("RAG_NO_CACHE"):
+            return func(model, prompt)
+
+        key = _cache_key(model, prompt)
+        content = _lookup(key)
+        if content is None:
+            content = func(model, prompt)
+            _store(key, content)
+        return content
+
+    return wrapper
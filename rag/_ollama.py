@@ -0,0 +1,43 @@
+import contextlib
+import contextvars
+
+import ollama
+from rag._llm_cache import llm_cache
+
+@llm_cache
+def chat(model, prompt):
+    response = ollama.chat(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        keep_alive="30m"
+    )
+    return response['message']['content'].strip()
+
+# The AsyncClient opened by the outermost async_client() scope; tasks started inside it
+# (e.g. by asyncio.gather) inherit it through their copied context
+_current_async_client = contextvars.ContextVar("ollama_async_client", default=None)
+
+@contextlib.asynccontextmanager
+async def async_client():
+    client = _current_async_client.get()
+    if client is not None:
+        yield client
+        return
+
+    async with ollama.AsyncClient() as client:
+        token = _current_async_client.set(client)
+        try:
+            yield client
+        finally:
+            _current_async_client.reset(token)
+
+@llm_cache
+async def achat(model, prompt):
+    # Outside an async_client() scope this opens and closes a one-off client
+    async with async_client() as client:
+        response = await client.chat(
+            model=model,
+            messages=[{"role": "user", "content": prompt}],
+            keep_alive="30m"
+        )
+    return response['message']['content'].strip()
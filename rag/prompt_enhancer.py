@@ -1,10 +1,11 @@
-import ollama
 import logging
+import string
+import ollama  # keeps rag.prompt_enhancer.ollama.chat patchable; rag._ollama calls through it
+from rag._ollama import chat, achat
 
 logger = logging.getLogger(__name__)
 
-def enhance_question(user_question: str, model: str = "mistral") -> str:
-    prompt = f"""
+_PROMPT = string.Template("""
 You are an expert **grammar correction assistant** in a Retrieval-Augmented Generation (RAG) system.
 
 ---
@@ -37,20 +38,37 @@ Examples:
 ---
 
 Input:
-{user_question}
+$question
 
  Output (corrected question):
-"""
+""")
+
+def _enhanced(user_question, enhanced):
+    logger.info(f"Original Question: {user_question}")
+    logger.info(f"Enhanced Question: {enhanced}")
+    return enhanced
+
+def _fallback(user_question, error):
+    logger.error(f"Error enhancing question: {error}")
+    return user_question
+
+def enhance_question(user_question: str, model: str = "mistral") -> str:
+    # Nothing to correct, so don't pay for a model round-trip
+    if not user_question.strip():
+        return user_question
+
+    try:
+        enhanced = chat(model, _PROMPT.substitute(question=user_question))
+    except Exception as e:
+        return _fallback(user_question, e)
+    return _enhanced(user_question, enhanced)
+
+async def enhance_question_async(user_question: str, model: str = "mistral") -> str:
+    if not user_question.strip():
+        return user_question
 
     try:
-        response = ollama.chat(
-            model=model,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        enhanced = response['message']['content'].strip()
-        logger.info(f"Original Question: {user_question}")
-        logger.info(f"Enhanced Question: {enhanced}")
-        return enhanced
+        enhanced = await achat(model, _PROMPT.substitute(question=user_question))
     except Exception as e:
-        logger.error(f"Error enhancing question: {e}")
-        return user_question  # fallback
+        return _fallback(user_question, e)
+    return _enhanced(user_question, enhanced)
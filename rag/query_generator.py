@@ -1,9 +1,10 @@
 # rag/query_generator.py
 
-import ollama
+import string
+import ollama  # keeps rag.query_generator.ollama.chat patchable; rag._ollama calls through it
+from rag._ollama import chat, achat
 
-def generate_sql(schema_text, enhanced_question, model="llama3"):
-    prompt = f"""
+_PROMPT = string.Template("""
 You are an advanced AI system that specializes in translating user questions into precise and executable SQL queries for a SQLite3 database.
 
 ---
@@ -39,19 +40,22 @@ Query Guidelines:
 ---
 
 Schema:
-{schema_text}
+$schema_text
 
 User Question:
-{enhanced_question}
+$question
 
 ---
 
 Output:
 Only return the generated SQL query, nothing else.
-"""
+""")
+
+def generate_sql(schema_text, enhanced_question, model="llama3"):
+    prompt = _PROMPT.substitute(schema_text=schema_text, question=enhanced_question)
     #print("debugging print--------------------" , enhanced_question)
-    response = ollama.chat(
-        model=model,
-        messages=[{"role": "user", "content": prompt}]
-    )
-    return response['message']['content'].strip()
+    return chat(model, prompt)
+
+async def generate_sql_async(schema_text, enhanced_question, model="llama3"):
+    prompt = _PROMPT.substitute(schema_text=schema_text, question=enhanced_question)
+    return await achat(model, prompt)
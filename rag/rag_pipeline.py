@@ -1,23 +1,160 @@
 # rag/rag_pipeline.py
 
+import asyncio
+import pathlib
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from rag._ollama import async_client
 from rag.utils import load_and_format_schema, init_logger, log_interaction
-from rag.query_generator import generate_sql
-from rag.result_interpreter import interpret_result
-from rag.prompt_enhancer import enhance_question 
+from rag.query_generator import generate_sql, generate_sql_async
+from rag.result_interpreter import interpret_result, interpret_result_async
+from rag.prompt_enhancer import enhance_question, enhance_question_async
+
+@dataclass(slots=True, frozen=True)
+class QueryResult:
+    columns: list | None
+    rows: list | None
+    error: str | None = None
+
+# One connection per thread and database file, reused across execute_sql calls
+_local = threading.local()
+
+def _get_conn(db_path):
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(db_path)
+    if conn is None:
+        conn = conns[db_path] = _connect_read_only(db_path)
+    return conn
+
+def _connect_read_only(db_path):
+    # Generated SQL only ever reads, so open read-only; writes and DDL are rejected.
+    # Read-only connections cannot change journal_mode; the CRUD writer sets WAL.
+    uri = pathlib.Path(db_path).absolute().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    conn.execute("PRAGMA cache_size=-131072")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+def execute_sql(query, db_path="data/company.db", max_rows=None, conn=None):
+    # Callers may pass their own connection; otherwise reuse this thread's one for db_path
+    if conn is None:
+        try:
+            conn = _get_conn(db_path)
+        except sqlite3.Error as e:
+            return QueryResult(None, None, f"❌ Error opening database: {str(e)}")
 
-def execute_sql(query, db_path="data/company.db"):
-    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
+        if max_rows is None:
+            results = cursor.fetchall()
+        else:
+            # Stop stepping the statement once the caller has enough rows
+            results = cursor.fetchmany(max_rows)
         columns = [description[0] for description in cursor.description]
-        conn.close()
-        return columns, results
+        return QueryResult(columns, results)
     except Exception as e:
-        conn.close()
-        return None, f"❌ Error executing query: {str(e)}"
+        return QueryResult(None, None, f"❌ Error executing query: {str(e)}")
+    finally:
+        cursor.close()
+
+def execute_sql_iter(query, db_path="data/company.db", chunk=256, conn=None):
+    # Streaming counterpart of execute_sql: rows are fetched chunk at a time as the caller
+    # iterates, and errors are raised rather than returned. Without conn, the stream gets its
+    # own connection, closed with the generator, so a half-read stream never holds a read
+    # transaction open on the connection execute_sql shares.
+    owned_conn = _connect_read_only(db_path) if conn is None else None
+    cursor = (owned_conn or conn).cursor()
+    cursor.arraysize = chunk
+    try:
+        cursor.execute(query)
+        columns = [description[0] for description in cursor.description]
+    except Exception:
+        cursor.close()
+        if owned_conn is not None:
+            owned_conn.close()
+        raise
+    return columns, _iter_rows(cursor, owned_conn)
+
+def _iter_rows(cursor, owned_conn):
+    try:
+        while rows := cursor.fetchmany():
+            yield from rows
+    finally:
+        cursor.close()
+        if owned_conn is not None:
+            owned_conn.close()
+
+def answer_question(raw_question, schema_text):
+    enhanced_question = enhance_question(raw_question)
+    sql_query = generate_sql(schema_text, enhanced_question)
+    result = execute_sql(sql_query)
+
+    explanation = None
+    if not result.error:
+        explanation = interpret_result(enhanced_question, sql_query, result.rows, result.columns)
+
+    return _answer(raw_question, enhanced_question, sql_query, result, explanation)
+
+async def answer_question_async(raw_question, schema_text):
+    # All three LLM stages share one AsyncClient, closed when the question is answered
+    # (or reused from an enclosing async_client() scope). Use answer_questions_async to
+    # run several at once without one failure cancelling the rest
+    async with async_client():
+        enhanced_question = await enhance_question_async(raw_question)
+        sql_query = await generate_sql_async(schema_text, enhanced_question)
+        result = await asyncio.to_thread(execute_sql, sql_query)
+
+        explanation = None
+        if not result.error:
+            explanation = await interpret_result_async(enhanced_question, sql_query, result.rows, result.columns)
+
+    return _answer(raw_question, enhanced_question, sql_query, result, explanation)
+
+def _answer(raw_question, enhanced_question, sql_query, result, explanation):
+    return {
+        "question": raw_question,
+        "enhanced_question": enhanced_question,
+        "sql_query": sql_query,
+        "columns": result.columns,
+        "results": result.rows,
+        "error": result.error,
+        "explanation": explanation,
+    }
+
+def _answer_or_error(raw_question, schema_text):
+    # One failing LLM call must not discard the rest of a batch
+    try:
+        return answer_question(raw_question, schema_text)
+    except Exception as e:
+        return _answer(raw_question, None, None, QueryResult(None, None, f"❌ Error answering question: {str(e)}"), None)
+
+async def _answer_or_error_async(raw_question, schema_text):
+    try:
+        return await answer_question_async(raw_question, schema_text)
+    except Exception as e:
+        return _answer(raw_question, None, None, QueryResult(None, None, f"❌ Error answering question: {str(e)}"), None)
+
+async def answer_questions_async(questions, schema_text):
+    async with async_client():
+        return await asyncio.gather(*(_answer_or_error_async(question, schema_text) for question in questions))
+
+def main_batch(questions, max_workers=8):
+    # Each worker blocks on ollama over HTTP, so threads overlap the round-trips
+    init_logger()
+    schema_text = load_and_format_schema()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        answers = list(executor.map(lambda question: _answer_or_error(question, schema_text), questions))
+
+    for answer in answers:
+        if answer["explanation"] is not None:
+            log_interaction(answer["question"], answer["sql_query"], answer["results"], answer["explanation"])
+    return answers
 
 def main():
     init_logger()
@@ -32,22 +169,22 @@ def main():
     print(f"\n📝 SQL Query:\n{sql_query}")
 
     print("\n📦 Executing SQL query on company.db...")
-    columns, results = execute_sql(sql_query)
+    result = execute_sql(sql_query)
 
-    if isinstance(results, str):
-        print(results)
+    if result.error:
+        print(result.error)
         return
 
     print("\n✅ Query Results:")
-    print(columns)
-    for row in results:
+    print(result.columns)
+    for row in result.rows:
         print(row)
 
     print("\n🧠 Passing result to LLM for explanation...")
-    explanation = interpret_result(enhanced_question, sql_query, results, columns)
+    explanation = interpret_result(enhanced_question, sql_query, result.rows, result.columns)
     print(f"\n💬 Explanation:\n{explanation}")
 
-    log_interaction(raw_question, sql_query, results, explanation)
+    log_interaction(raw_question, sql_query, result.rows, explanation)
 
 if __name__ == "__main__":
     main()
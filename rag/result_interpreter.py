@@ -1,15 +1,11 @@
-import ollama
-
-def interpret_result(user_question, sql_query, data, columns, model="llama3", max_rows=10):
-    # Only show first N rows if too many
-    if len(data) > max_rows:
-        data = data[:max_rows]
-
-    result_text = "\n".join(
-        [", ".join(f"{columns[i]}: {row[i]}" for i in range(len(columns))) for row in data]
-    )
-
-    prompt = f"""
+import asyncio
+import functools
+import itertools
+import string
+import ollama  # keeps rag.result_interpreter.ollama.chat patchable; rag._ollama calls through it
+from rag._ollama import chat, achat, async_client
+
+_PROMPT = string.Template("""
 You are a powerful and helpful AI assistant integrated into a Retrieval-Augmented Generation (RAG) system. Your role is to interpret the results of SQL queries executed on a SQLite3 database and respond clearly to the user.
 
 ---
@@ -42,22 +38,65 @@ Interpretation Logic:
 
 Inputs:
 
-- User Question: "{user_question}"
+- User Question: "$question"
 - Executed SQL Query:
-{sql_query}
+$sql_query
 
-- Query Result Preview (first {len(data)} rows):
-{result_text}
+- Query Result Preview ($row_label):
+$result_text
 
 ---
 
 Based on the user's request, decide the appropriate response type.
 
 Only return your final response. Do NOT repeat these instructions.
-"""
-
-    response = ollama.chat(
-        model=model,
-        messages=[{"role": "user", "content": prompt}]
+""")
+
+@functools.lru_cache(maxsize=32)
+def _row_format(columns):
+    # One format string per column shape, e.g. "Name: {}, Email: {}". Braces in
+    # column names (which come from generated SQL) are escaped so they print literally.
+    return ", ".join(str(column).replace("{", "{{").replace("}", "}}") + ": {}" for column in columns)
+
+def _build_prompt(user_question, sql_query, rows, columns, row_label):
+    row_format = _row_format(tuple(columns))
+    result_text = "\n".join(row_format.format(*row) for row in rows)
+
+    return _PROMPT.substitute(
+        question=user_question,
+        sql_query=sql_query,
+        row_label=row_label,
+        result_text=result_text,
     )
-    return response['message']['content'].strip()
+
+def _build_prompts(user_question, sql_query, data, columns, max_rows, batch_rows):
+    if batch_rows is None:
+        # Only show first N rows if too many; a lazy row iterator is not read past them
+        rows = list(itertools.islice(data, max_rows))
+        return [_build_prompt(user_question, sql_query, rows, columns, f"first {len(rows)} rows")]
+
+    data = list(data)
+    if len(data) <= batch_rows:
+        return [_build_prompt(user_question, sql_query, data, columns, f"first {len(data)} rows")]
+
+    # Cover every row, batch_rows per prompt, instead of truncating to max_rows
+    return [
+        _build_prompt(
+            user_question,
+            sql_query,
+            data[start:start + batch_rows],
+            columns,
+            f"rows {start + 1}-{min(start + batch_rows, len(data))} of {len(data)}",
+        )
+        for start in range(0, len(data), batch_rows)
+    ]
+
+def interpret_result(user_question, sql_query, data, columns, model="llama3", max_rows=10, batch_rows=None):
+    prompts = _build_prompts(user_question, sql_query, data, columns, max_rows, batch_rows)
+    return "\n\n".join(chat(model, prompt) for prompt in prompts)
+
+async def interpret_result_async(user_question, sql_query, data, columns, model="llama3", max_rows=10, batch_rows=None):
+    prompts = _build_prompts(user_question, sql_query, data, columns, max_rows, batch_rows)
+    async with async_client():
+        explanations = await asyncio.gather(*(achat(model, prompt) for prompt in prompts))
+    return "\n\n".join(explanations)
@@ -1,30 +1,84 @@
+import atexit
+import functools
 import json
 import logging
+import logging.handlers
+import os
 from datetime import datetime
 
-def load_and_format_schema(schema_path="schema/db_schema.json"):
-    with open(schema_path, "r") as f:
-        schema = json.load(f)
-    
-    formatted = ""
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@functools.lru_cache(maxsize=8)
+def _load_schema_cached(schema_path, mtime_ns):
+    # mtime_ns only keys the cache, so an edited schema file is re-read
+    with open(schema_path, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+@functools.lru_cache(maxsize=8)
+def _format_schema_cached(schema_path, mtime_ns):
+    schema = _load_schema_cached(schema_path, mtime_ns)
+
+    parts = []
     for table, content in schema["tables"].items():
-        formatted += f"Table: {table}\n"
-        for column, desc in content["columns"].items():
-            formatted += f"  - {column}: {desc}\n"
-        formatted += "\n"
-    
-    return formatted
+        parts.append(f"Table: {table}\n")
+        parts.extend(f"  - {column}: {desc}\n" for column, desc in content["columns"].items())
+        parts.append("\n")
+
+    return "".join(parts)
+
+def load_and_format_schema(schema_path="schema/db_schema.json"):
+    schema_path = os.path.abspath(schema_path)
+    return _format_schema_cached(schema_path, os.stat(schema_path).st_mtime_ns)
 
 def init_logger(log_path="logs/rag.log"):
-    logging.basicConfig(
-        filename=log_path,
-        filemode='a',
-        format='%(asctime)s - %(message)s',
-        level=logging.INFO
-    )
+    root = logging.getLogger()
+    # Repeated calls must not stack handlers and write every record twice
+    if root.handlers:
+        return root
+
+    handler = logging.FileHandler(log_path, mode='a', delay=True)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+    # Batch records in memory so each interaction is not a separate write
+    buffered = logging.handlers.MemoryHandler(capacity=512, target=handler)
+    root.addHandler(buffered)
+    atexit.register(buffered.flush)
+    root.setLevel(logging.INFO)
+    return root
+
+MAX_LOGGED_ROWS = 20
+MAX_LOGGED_CHARS = 2048
+
+def _truncate(text, limit=MAX_LOGGED_CHARS):
+    text = str(text)
+    if len(text) > limit:
+        return f"{text[:limit]}...(+{len(text) - limit} chars)"
+    return text
 
 def log_interaction(user_query, sql_query, results, explanation):
-    logging.info("USER QUESTION: %s", user_query)
-    logging.info("SQL GENERATED: %s", sql_query)
-    logging.info("DB RESULT: %s", results)
-    logging.info("LLM EXPLANATION: %s\n", explanation)
+    # Skip formatting large results entirely when nothing would be written
+    if not logging.getLogger().isEnabledFor(logging.INFO):
+        return
+
+    results_text = str(results[:MAX_LOGGED_ROWS])
+    if len(results) > MAX_LOGGED_ROWS:
+        results_text += f"...(+{len(results) - MAX_LOGGED_ROWS} rows)"
+
+    fields = {
+        "user_query": user_query,
+        "sql_query": _truncate(sql_query),
+        "results": results_text,
+        "explanation": _truncate(explanation),
+    }
+    # One record per interaction; the fields also ride along as attributes for structured handlers
+    logging.info(
+        "USER QUESTION: %(user_query)s\n"
+        "SQL GENERATED: %(sql_query)s\n"
+        "DB RESULT: %(results)s\n"
+        "LLM EXPLANATION: %(explanation)s\n",
+        fields,
+        extra=fields,
+    )